@@ -4,3 +4,6 @@ __all__ = ["pdf", "features"]
 
 from scipdf.features.text_utils import *
 from scipdf.pdf.parse_pdf import *
+from scipdf.pdf.triage import *
+from scipdf.pdf.service import ParseService
+from scipdf.pdf.limiter import AdaptiveLimiter
@@ -1,7 +1,12 @@
-from .text_utils import compute_readability_stats, compute_text_stats
+from .text_utils import (
+    compute_readability_stats,
+    compute_readability_stats_batch,
+    compute_text_stats,
+)
 
 __all__ = [
     "compute_readability_stats",
+    "compute_readability_stats_batch",
     "compute_text_stats",
     "compute_journal_features",
 ]
@@ -1,8 +1,11 @@
+import re
+import math
 import numpy as np
 import pandas as pd
 import textstat
 import spacy
 from collections import Counter
+from functools import lru_cache
 from itertools import groupby
 
 
@@ -37,31 +40,227 @@ SECTIONS_MAPS = {
 }
 
 
+# regular expressions used by ``textstat`` to split words and sentences
+CONTRACTION_APOSTROPHE_REGEX = re.compile(r"\'(?![tsd]|ve|ll|re)")
+PUNCTUATION_REGEX = re.compile(r"[^\w\s\']")
+SENTENCE_REGEX = re.compile(r"\b[^.!?]+[.!?]*", re.UNICODE)
+LETTER_REGEX = re.compile(r"\w")
+SPACE_REGEX = re.compile(r"\s")
+
+# number of lower-cased words whose ``(n_syllable, is_easy_word)`` is kept in cache
+WORD_CACHE_SIZE = 2 ** 16
+
+
+def remove_punctuation(text):
+    """
+    Remove punctuation from a given text, keeping apostrophes of English contractions
+    (same as ``textstat.remove_punctuation`` with ``rm_apostrophe=False``)
+    """
+    text = CONTRACTION_APOSTROPHE_REGEX.sub("", text)
+    return PUNCTUATION_REGEX.sub("", text)
+
+
+@lru_cache(maxsize=WORD_CACHE_SIZE)
+def lookup_word(word):
+    """
+    Return number of syllables and whether a given lower-cased word is in the
+    Dale-Chall easy words list. Results are computed with ``textstat`` and the
+    ``WORD_CACHE_SIZE`` most recently used words are cached
+    """
+    return (
+        textstat.syllable_count(word),
+        not textstat.is_difficult_word(word, syllable_threshold=0),
+    )
+
+
+def count_sentences(text):
+    """
+    Count sentences of a given text, ignoring sentences with two words or less
+    (same as ``textstat.sentence_count``)
+    """
+    if len(text) == 0:
+        return 0
+    sentences = SENTENCE_REGEX.findall(text)
+    n_ignore = sum([len(remove_punctuation(s).split()) <= 2 for s in sentences])
+    return max(1, len(sentences) - n_ignore)
+
+
+def compute_linsear_write(raw_words, words, n_sents):
+    """
+    Compute Linsear Write formula from the first 100 words of a text
+    (same as ``textstat.linsear_write_formula``)
+
+    Parameters
+    ==========
+    raw_words: list, white space separated tokens of the text
+    words: list, tokens of the text after removing punctuation
+    n_sents: int, number of sentences in the text
+    """
+    # textstat counts sentences of the joined tokens, none for a blank text
+    if len(raw_words) == 0:
+        return 0.0
+    if len(raw_words) > 100:
+        words = []
+        i_text = 0
+        while i_text < len(raw_words) and len(words) < 100:
+            word = remove_punctuation(raw_words[i_text])
+            i_text += 1
+            if len(word) > 0:
+                words.append(word)
+        n_sents = count_sentences(" ".join(raw_words[:i_text]))
+    if n_sents == 0:
+        return 0.0
+    n_easy, n_difficult = 0, 0
+    for word in words:
+        n_syllable = lookup_word(word.lower())[0]
+        if n_syllable >= 3:
+            n_difficult += 1
+        elif n_syllable > 0:
+            n_easy += 1
+    score = (n_easy + 3 * n_difficult) / n_sents
+    if score <= 20:
+        score -= 2
+    return score / 2
+
+
+def grade_suffix(grade):
+    """
+    Ordinal suffix of a given grade e.g. ``st`` for 1, ``th`` for 11
+    """
+    if grade % 100 in (11, 12, 13):
+        return "th"
+    return {1: "st", 2: "nd", 3: "rd"}.get(grade % 10, "th")
+
+
+def compute_text_standard(readability_dict):
+    """
+    Compute readability consensus grade from the scores in ``readability_dict``
+    (same as ``textstat.text_standard``)
+    """
+    def append_grade(score):
+        grade.extend([math.floor(score), math.ceil(score), round(score)])
+
+    grade = []
+    append_grade(readability_dict["flesch_kincaid_grade"])
+    reading_ease = readability_dict["flesch_reading_ease"]
+    if 90 <= reading_ease < 100:
+        grade.append(5)
+    elif 80 <= reading_ease < 90:
+        grade.append(6)
+    elif 70 <= reading_ease < 80:
+        grade.append(7)
+    elif 60 <= reading_ease < 70:
+        grade.extend([8, 9])
+    elif 50 <= reading_ease < 60:
+        grade.append(10)
+    elif 40 <= reading_ease < 50:
+        grade.append(11)
+    elif 30 <= reading_ease < 40:
+        grade.append(12)
+    else:
+        grade.append(13)
+    for key in [
+        "smog",
+        "coleman_liau_index",
+        "automated_readability_index",
+        "dale_chall",
+        "linsear_write",
+        "gunning_fog",
+    ]:
+        append_grade(readability_dict[key])
+    # most common grade (first one added wins ties), clamped to grade 1 to 18
+    standard = max(1, min(Counter(grade).most_common(1)[0][0], 18))
+    lower = int(standard) - 1
+    return "%d%s and %d%s grade" % (
+        lower, grade_suffix(lower), lower + 1, grade_suffix(lower + 1)
+    )
+
+
 def compute_readability_stats(text):
     """
     Compute reading statistics of the given text
     Reference: https://github.com/shivam5992/textstat
 
+    The text is tokenized into words and sentences only once and all scores
+    are derived from these counts. Syllable counts and easy words lookup are
+    cached per word (see ``lookup_word``) so repeated words across sections
+    and documents are only looked up once. Scores are the same as calling
+    the corresponding ``textstat`` functions on the English text.
+
     Parameters
     ==========
     text: str, input section or abstract text
     """
     try:
+        raw_words = text.split()
+        words = remove_punctuation(text).split()
+        n_word = len(words)
+        n_sents = count_sentences(text)
+        n_chars = len(SPACE_REGEX.sub("", text))
+        n_letters = len(LETTER_REGEX.findall(text))
+
+        n_syllable, n_polysyllable, n_dale_chall, n_fog = 0, 0, 0, 0
+        difficult_words = set()
+        for word in words:
+            n, is_easy = lookup_word(word.lower())
+            n_syllable += n
+            if n >= 3:
+                n_polysyllable += 1
+            if not is_easy:
+                n_dale_chall += 1
+                if n >= 2:
+                    difficult_words.add(word)
+                if n >= 3:
+                    n_fog += 1
+
+        word_per_sent = n_word / n_sents if n_sents > 0 else 0.0
+        syllable_per_word = n_syllable / n_word if n_word > 0 else 0.0
+        letter_per_word = n_letters / n_word if n_word > 0 else 0.0
+        sent_per_word = n_sents / n_word if n_word > 0 else 0.0
+        char_per_word = n_chars / len(raw_words) if len(raw_words) > 0 else 0.0
+
+        if word_per_sent == 0 or syllable_per_word == 0:
+            flesch_reading_ease, flesch_kincaid_grade = 0.0, 0.0
+        else:
+            flesch_reading_ease = 206.835 - 1.015 * word_per_sent - 84.6 * syllable_per_word
+            flesch_kincaid_grade = 0.39 * word_per_sent + 11.8 * syllable_per_word - 15.59
+        if n_sents > 0:
+            smog = (1.043 * (30 * (n_polysyllable / n_sents)) ** 0.5) + 3.1291
+        else:
+            smog = 0.0
+        if letter_per_word == 0 or sent_per_word == 0:
+            coleman_liau_index = 0.0
+        else:
+            coleman_liau_index = 0.058 * (letter_per_word * 100) - 0.296 * (sent_per_word * 100) - 15.8
+        if char_per_word == 0 or word_per_sent == 0:
+            automated_readability_index = 0.0
+        else:
+            automated_readability_index = 4.71 * char_per_word + 0.5 * word_per_sent - 21.43
+        if n_word > 0:
+            percent_difficult = 100 * n_dale_chall / n_word
+            dale_chall = 0.1579 * percent_difficult + 0.0496 * word_per_sent
+            if percent_difficult > 5:
+                dale_chall += 3.6365
+            gunning_fog = 0.4 * (word_per_sent + 100 * n_fog / n_word)
+        else:
+            dale_chall, gunning_fog = 0.0, 0.0
+
         readability_dict = {
-            "flesch_reading_ease": textstat.flesch_reading_ease(text),
-            "smog": textstat.smog_index(text),
-            "flesch_kincaid_grade": textstat.flesch_kincaid_grade(text),
-            "coleman_liau_index": textstat.coleman_liau_index(text),
-            "automated_readability_index": textstat.automated_readability_index(text),
-            "dale_chall": textstat.dale_chall_readability_score(text),
-            "difficult_words": textstat.difficult_words(text),
-            "linsear_write": textstat.linsear_write_formula(text),
-            "gunning_fog": textstat.gunning_fog(text),
-            "text_standard": textstat.text_standard(text),
-            "n_syllable": textstat.syllable_count(text),
-            "avg_letter_per_word": textstat.avg_letter_per_word(text),
-            "avg_sentence_length": textstat.avg_sentence_length(text),
+            "flesch_reading_ease": flesch_reading_ease,
+            "smog": smog,
+            "flesch_kincaid_grade": flesch_kincaid_grade,
+            "coleman_liau_index": coleman_liau_index,
+            "automated_readability_index": automated_readability_index,
+            "dale_chall": dale_chall,
+            "difficult_words": len(difficult_words),
+            "linsear_write": compute_linsear_write(raw_words, words, n_sents),
+            "gunning_fog": gunning_fog,
+            "text_standard": None,
+            "n_syllable": n_syllable,
+            "avg_letter_per_word": letter_per_word,
+            "avg_sentence_length": word_per_sent,
         }
+        readability_dict["text_standard"] = compute_text_standard(readability_dict)
     except:
         readability_dict = {
             "flesch_reading_ease": None,
@@ -81,6 +280,29 @@ def compute_readability_stats(text):
     return readability_dict
 
 
+def compute_readability_stats_batch(texts):
+    """
+    Compute reading statistics for a list of texts, see ``compute_readability_stats``.
+    The syllable and easy words cache is shared between all texts and identical
+    texts are only computed once.
+
+    Parameters
+    ==========
+    texts: list, list of section or abstract texts
+
+    Output
+    ======
+    readability_list: list, list of reading statistics dictionary, one for each text
+    """
+    readability_stats = {}
+    readability_list = []
+    for text in texts:
+        if text not in readability_stats:
+            readability_stats[text] = compute_readability_stats(text)
+        readability_list.append(dict(readability_stats[text]))
+    return readability_list
+
+
 def compute_text_stats(text):
     """
     Compute part of speech features from a given spacy wrapper of text
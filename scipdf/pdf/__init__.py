@@ -1,4 +1,7 @@
 from .parse_pdf import *
+from .triage import TRIAGE_RULES, triage_pdf, route_pdf, triage_pdfs
+from .service import ParseService
+from .limiter import AdaptiveLimiter
 
 __all__ = [
     "list_pdf_paths",
@@ -6,4 +9,11 @@ __all__ = [
     "parse_figure_caption",
     "parse_references",
     "parse_pdf_to_dict",
+    "parse_pdfs_to_dict",
+    "TRIAGE_RULES",
+    "triage_pdf",
+    "route_pdf",
+    "triage_pdfs",
+    "ParseService",
+    "AdaptiveLimiter",
 ]
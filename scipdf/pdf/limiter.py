@@ -0,0 +1,186 @@
+import threading
+import statistics
+from collections import deque
+
+
+class AdaptiveLimiter:
+    """
+    Limit the number of concurrent requests to GROBID and adapt the limit from
+    observed latency and busy responses (additive increase, multiplicative decrease)
+
+    The limit grows by ``increase`` after a full window of successful requests.
+    It is multiplied by ``decrease_factor`` when GROBID is busy or fails, or when
+    the median latency of the last ``patience`` requests is ``latency_tolerance``
+    times higher than the long term latency, which happens when requests start
+    queueing inside GROBID. Latency is divided by the size of the request e.g.
+    its number of pages, and the median ignores a single slow request, so that
+    long PDFs do not reduce the limit. Slow windows do not change the long term
+    latency unless they are still slow at ``min_limit``.
+
+    The limit is decreased at most once per congestion event: requests acquired
+    before the last decrease were sent at the previous limit and their busy
+    responses or latency are ignored, see the ticket returned by ``acquire``.
+
+    Parameters
+    ==========
+    max_limit: int, ceiling of concurrent requests set by the user
+    min_limit: int, floor of concurrent requests
+    initial_limit: int, starting limit, default is ``min_limit``
+    increase: float, increase of the limit after a window of successful requests
+    decrease_factor: float, factor applied to the limit on busy responses or high latency
+    latency_tolerance: float, ratio of median latency to long term latency considered
+        as slow, it has to be larger than the usual spread of latency per size
+    patience: int, number of latest requests used for the median latency
+    smoothing: float, weight of a new median latency in the long term latency when
+        it decreases, a 3 times smaller weight is used when it increases
+
+    Example
+    =======
+    >> limiter = AdaptiveLimiter(max_limit=16)
+    >> ticket = limiter.acquire()
+    >> ... # request to GROBID
+    >> limiter.release(latency=2.5, ok=True, size=12, ticket=ticket) # number of pages
+    """
+
+    def __init__(
+        self,
+        max_limit: int = 8,
+        min_limit: int = 1,
+        initial_limit: int = None,
+        increase: float = 1.0,
+        decrease_factor: float = 0.5,
+        latency_tolerance: float = 1.5,
+        patience: int = 5,
+        smoothing: float = 0.05,
+    ):
+        if not 1 <= min_limit <= max_limit:
+            raise ValueError("Limits must satisfy 1 <= min_limit <= max_limit")
+        self.max_limit = max_limit
+        self.min_limit = min_limit
+        self.increase = increase
+        self.decrease_factor = decrease_factor
+        self.latency_tolerance = latency_tolerance
+        self.patience = patience
+        self.smoothing = smoothing
+        self._limit = float(initial_limit or min_limit)
+        self._in_flight = 0
+        self._waiting = 0
+        self._pending = 0  # documents submitted but not finished
+        self._n_decrease = 0  # number of decreases, used as ticket by ``acquire``
+        self._long_latency = None  # long term latency per size
+        self._latencies = deque(maxlen=patience)  # latest latency per size
+        self._condition = threading.Condition()
+
+    @property
+    def limit(self):
+        """
+        Current number of allowed concurrent requests
+        """
+        return max(self.min_limit, min(int(self._limit), self.max_limit))
+
+    @property
+    def in_flight(self):
+        """
+        Number of requests being processed by GROBID
+        """
+        return self._in_flight
+
+    @property
+    def queue_depth(self):
+        """
+        Number of documents waiting to be sent to GROBID, i.e. pending documents
+        (see ``add_pending``) or requests waiting for the limiter
+        """
+        return max(self._pending - self._in_flight, self._waiting)
+
+    def add_pending(self, n: int = 1):
+        """
+        Count ``n`` documents submitted for parsing in ``queue_depth``
+        until ``remove_pending`` is called for them
+        """
+        with self._condition:
+            self._pending += n
+
+    def remove_pending(self, n: int = 1):
+        """
+        Remove ``n`` finished documents from ``queue_depth``
+        """
+        with self._condition:
+            self._pending = max(self._pending - n, 0)
+
+    def acquire(self):
+        """
+        Wait until a request can be sent to GROBID and return a ticket
+        to pass to ``release``
+        """
+        with self._condition:
+            self._waiting += 1
+            self._condition.wait_for(lambda: self._in_flight < self.limit)
+            self._waiting -= 1
+            self._in_flight += 1
+            return self._n_decrease
+
+    def release(
+        self, latency: float, ok: bool = True, size: float = 1.0, ticket: int = None
+    ):
+        """
+        Report the end of a request and update the limit
+
+        Parameters
+        ==========
+        latency: float, time taken by the request in seconds
+        ok: bool, False if GROBID was busy, timed out or failed
+        size: float, size of the request e.g. number of pages of the PDF, latency
+            is divided by size so that longer PDFs are not considered as slow
+        ticket: int, ticket returned by ``acquire``, the request is ignored if the
+            limit was decreased after it was acquired
+        """
+        with self._condition:
+            self._in_flight -= 1
+            if ticket is not None and ticket < self._n_decrease:
+                # sent before the last decrease, already accounted for
+                pass
+            elif not ok:
+                self._decrease()
+            else:
+                self._latencies.append(latency / size if size > 0 else latency)
+                self._update()
+            self._condition.notify_all()
+
+    def _update(self):
+        if len(self._latencies) < self.patience:
+            return
+        latency = statistics.median(self._latencies)
+        if self._long_latency is None:
+            self._long_latency = latency
+        if latency <= self.latency_tolerance * self._long_latency:
+            # the long term latency rises 3 times slower than it falls so that
+            # it stays close to the latency without queueing
+            smoothing = self.smoothing
+            if latency > self._long_latency:
+                smoothing = self.smoothing / 3
+            self._long_latency += smoothing * (latency - self._long_latency)
+            self._limit = min(self._limit + self.increase / self.limit, self.max_limit)
+        elif self.limit <= self.min_limit:
+            # still slow without concurrency, the server or the documents
+            # changed so the long term latency starts again from here
+            self._long_latency = latency
+            self._latencies.clear()
+        else:
+            self._decrease()
+
+    def _decrease(self):
+        self._limit = max(self._limit * self.decrease_factor, self.min_limit)
+        self._n_decrease += 1
+        self._latencies.clear()
+
+    def status(self):
+        """
+        Return current limit, number of in-flight requests and waiting documents
+        """
+        return {
+            "limit": self.limit,
+            "max_limit": self.max_limit,
+            "in_flight": self._in_flight,
+            "queue_depth": self.queue_depth,
+        }
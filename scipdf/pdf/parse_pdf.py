@@ -1,5 +1,6 @@
 import re
 import os
+import time
 import os.path as op
 from glob import glob
 import urllib
@@ -11,6 +12,9 @@ from PIL import Image
 import io
 from bs4 import BeautifulSoup, NavigableString
 from tqdm import tqdm, tqdm_notebook
+from concurrent.futures import ThreadPoolExecutor
+from .triage import triage_and_route_pdf
+from .limiter import AdaptiveLimiter
 
 
 GROBID_URL = "http://localhost:8070"
@@ -18,6 +22,8 @@ DIR_PATH = op.dirname(op.abspath(__file__))
 PDF_FIGURES_JAR_PATH = op.join(
     DIR_PATH, "pdffigures2", "pdffigures2-assembly-0.0.12-SNAPSHOT.jar"
 )
+GROBID_BUSY_STATUS = (429, 503)  # GROBID returns 503 when its pool is full
+N_RETRIES = 3  # number of retries when GROBID is busy
 
 
 def list_pdf_paths(pdf_folder: str):
@@ -43,12 +49,55 @@ def validate_url(path: str):
     return re.match(regex, path) is not None
 
 
+def post_to_grobid(
+    url: str,
+    files: list,
+    limiter: AdaptiveLimiter = None,
+    timeout: float = None,
+):
+    """
+    Send PDF to GROBID and return the response text. If ``limiter`` is given,
+    wait for the limiter before sending, report latency, busy responses and
+    timeouts to it and retry. Return None if GROBID is still busy after retries
+    """
+    if limiter is None:
+        return requests.post(url, files=files, timeout=timeout).text
+
+    # latency is normalized by the number of pages, see ``AdaptiveLimiter.release``
+    n_pages = 1
+    try:
+        with fitz.open(stream=dict(files).get("input"), filetype="pdf") as doc:
+            n_pages = max(doc.page_count, 1)
+    except Exception:
+        pass
+    for i in range(N_RETRIES + 1):
+        ticket = limiter.acquire()
+        start = time.monotonic()
+        ok = False
+        try:
+            response = requests.post(url, files=files, timeout=timeout)
+            ok = response.status_code not in GROBID_BUSY_STATUS
+        except requests.exceptions.Timeout:
+            response = None
+        finally:
+            limiter.release(
+                time.monotonic() - start, ok=ok, size=n_pages, ticket=ticket
+            )
+        if ok:
+            return response.text
+        if i < N_RETRIES:
+            time.sleep(i + 1)
+    return None
+
+
 def parse_pdf(
     pdf_path: str,
     fulltext: bool = True,
     soup: bool = False,
     return_coordinates: bool = False,
     grobid_url: str = GROBID_URL,
+    limiter: AdaptiveLimiter = None,
+    timeout: float = None,
 ):
     """
     Function to parse PDF to XML or BeautifulSoup using GROBID tool
@@ -65,6 +114,8 @@ def parse_pdf(
     grobid_url: str, url to GROBID parser, default at 'http://localhost:8070'
         This could be changed to "https://cloud.science-miner.com/grobid/" for the cloud service
     soup: bool, if True, return BeautifulSoup of the article
+    limiter: AdaptiveLimiter, if given, limit concurrent requests to GROBID, see ``limiter.py``
+    timeout: float, timeout of the request to GROBID in seconds, default is no timeout
 
     Output
     ======
@@ -97,18 +148,18 @@ def parse_pdf(
         elif validate_url(pdf_path) and op.splitext(pdf_path)[-1] == ".pdf":
             page = urllib.request.urlopen(pdf_path).read()
             files += [("input", page)]
-            parsed_article = requests.post(url, files=files).text
+            parsed_article = post_to_grobid(url, files, limiter=limiter, timeout=timeout)
         elif op.exists(pdf_path):
-            files += [("input", (open(pdf_path, "rb")))]
-            parsed_article = requests.post(
-                url, files=files
-            ).text
+            # read bytes so that the request can be sent again when GROBID is busy
+            with open(pdf_path, "rb") as f:
+                files += [("input", f.read())]
+            parsed_article = post_to_grobid(url, files, limiter=limiter, timeout=timeout)
         else:
             parsed_article = None
     elif isinstance(pdf_path, bytes):
         # assume that incoming is byte string
         files += [("input", (pdf_path))]
-        parsed_article = requests.post(url, files=files).text
+        parsed_article = post_to_grobid(url, files, limiter=limiter, timeout=timeout)
     else:
         parsed_article = None
 
@@ -381,6 +432,9 @@ def parse_pdf_to_dict(
     return_coordinates: bool = True,
     grobid_url: str = GROBID_URL,
     parse_figures: bool = True,
+    triage_rules: dict = None,
+    limiter: AdaptiveLimiter = None,
+    timeout: float = None,
 ):
     """
     Parse the given PDF and return dictionary of the parsed article
@@ -393,23 +447,89 @@ def parse_pdf_to_dict(
     as_list: bool, whether to return list of sections or not
     grobid_url: str, url to grobid server, default is `GROBID_URL`
         This could be changed to "https://kermitt2-grobid.hf.space" for the cloud service
+    triage_rules: dict, if given, check the local PDF with ``triage_pdf`` first and
+        only send it to GROBID when it is routed to ``grobid``, see ``TRIAGE_RULES``
+    limiter: AdaptiveLimiter, if given, limit concurrent requests to GROBID
+    timeout: float, timeout of the request to GROBID in seconds, default is no timeout
 
     Ouput
     =====
-    article_dict: dict, dictionary of an article
+    article_dict: dict, dictionary of an article, None if the PDF is not routed to GROBID
     """
+    if triage_rules is not None and not (
+        isinstance(pdf_path, str) and validate_url(pdf_path)
+    ):
+        if triage_and_route_pdf(pdf_path, rules=triage_rules)["route"] != "grobid":
+            return None
+
     parsed_article = parse_pdf(
         pdf_path,
         fulltext=fulltext,
         soup=soup,
         return_coordinates=return_coordinates,
         grobid_url=grobid_url,
+        limiter=limiter,
+        timeout=timeout,
     )
     article_dict = convert_article_soup_to_dict(parsed_article, as_list=as_list)
 
     return article_dict
 
 
+def parse_pdfs_to_dict(
+    pdf_paths: list,
+    max_concurrency: int = 8,
+    limiter: AdaptiveLimiter = None,
+    timeout: float = 300,
+    **kwargs,
+):
+    """
+    Parse a list of PDFs in parallel. The number of concurrent requests to GROBID
+    adapts to GROBID latency and busy responses up to ``max_concurrency``
+
+    Parameters
+    ==========
+    pdf_paths: list, list of paths, URLs or bytes of PDFs
+    max_concurrency: int, maximum number of concurrent requests to GROBID
+    limiter: AdaptiveLimiter, limiter shared between calls, default is a new
+        ``AdaptiveLimiter(max_limit=max_concurrency)``, ``limiter.status()`` returns
+        its current limit and number of PDFs waiting to be sent to GROBID
+    timeout: float, timeout of each request to GROBID in seconds, timed out
+        requests are reported to the limiter and retried
+    kwargs: other arguments passed to ``parse_pdf_to_dict``
+
+    Output
+    ======
+    article_dicts: list, list of article dictionaries in the same order as ``pdf_paths``,
+        None for PDFs that fail to parse
+
+    Example
+    =======
+    >> limiter = AdaptiveLimiter(max_limit=16)
+    >> article_dicts = parse_pdfs_to_dict(list_pdf_paths(pdf_folder), limiter=limiter)
+    """
+    if limiter is None:
+        limiter = AdaptiveLimiter(max_limit=max_concurrency)
+
+    def parse(pdf_path):
+        try:
+            return parse_pdf_to_dict(
+                pdf_path, limiter=limiter, timeout=timeout, **kwargs
+            )
+        except Exception:
+            return None
+        finally:
+            limiter.remove_pending()
+
+    # PDFs waiting for a thread are counted in ``limiter.queue_depth``
+    pdf_paths = list(pdf_paths)
+    limiter.add_pending(len(pdf_paths))
+    # threads only wait for the limiter, so the pool can be as large as the ceiling
+    with ThreadPoolExecutor(max_workers=limiter.max_limit) as executor:
+        article_dicts = list(executor.map(parse, pdf_paths))
+    return article_dicts
+
+
 def parse_figures(
     pdf_folder: str,
     jar_path: str = PDF_FIGURES_JAR_PATH,
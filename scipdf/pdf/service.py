@@ -0,0 +1,249 @@
+import json
+import asyncio
+import hashlib
+import argparse
+import itertools
+from urllib.parse import urlparse, parse_qs
+from .parse_pdf import GROBID_URL, parse_pdf_to_dict
+
+
+HTTP_STATUS = {
+    200: "OK",
+    400: "Bad Request",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    413: "Payload Too Large",
+    502: "Bad Gateway",
+    503: "Service Unavailable",
+}
+MAX_PDF_SIZE = 100 * 1024 * 1024  # maximum size of uploaded PDF in bytes
+
+
+class ParseService:
+    """
+    Small asyncio HTTP service that parses uploaded PDFs to dictionary using
+    ``parse_pdf_to_dict``. Identical PDFs that are requested at the same time
+    are parsed only once and all requests wait for the same result.
+    PDFs are parsed in priority order (lower value first) by ``n_workers``
+    workers and requests are rejected with 503 when ``max_queue`` PDFs are waiting.
+
+    Endpoints
+    =========
+    POST /parse?priority=0&as_list=false, body is the PDF bytes, return parsed dictionary as JSON
+    GET /status, return number of queued, in-flight PDFs and waiting requests as JSON
+
+    Example
+    =======
+    >> service = ParseService(grobid_url="http://localhost:8070", n_workers=4)
+    >> asyncio.run(service.serve(host="127.0.0.1", port=8080))
+    >> curl -X POST --data-binary @example_data/futoma2017improved.pdf http://127.0.0.1:8080/parse
+    """
+
+    def __init__(
+        self,
+        grobid_url: str = GROBID_URL,
+        n_workers: int = 4,
+        max_queue: int = 100,
+        parse_kwargs: dict = None,
+    ):
+        self.grobid_url = grobid_url
+        self.n_workers = n_workers
+        self.max_queue = max_queue
+        self.parse_kwargs = parse_kwargs or {}
+        self.in_flight = {}  # content hash to future of the parsed dictionary
+        self.n_waiting = 0  # number of requests waiting for a parsed dictionary
+        self.counter = itertools.count()  # keep FIFO order within the same priority
+        self.queue = None
+        self.workers = []
+        self.server = None
+
+    def status(self):
+        """
+        Return number of queued PDFs, PDFs being parsed or queued, requests
+        waiting for them and workers
+        """
+        return {
+            "queued": self.queue.qsize() if self.queue is not None else 0,
+            "in_flight": len(self.in_flight),
+            "waiting": self.n_waiting,
+            "max_queue": self.max_queue,
+            "n_workers": self.n_workers,
+        }
+
+    def parse_pdf(self, pdf_bytes: bytes, as_list: bool = False):
+        """
+        Parse PDF bytes with GROBID, run in a thread by the workers
+        """
+        kwargs = {**self.parse_kwargs, "as_list": as_list, "grobid_url": self.grobid_url}
+        return parse_pdf_to_dict(pdf_bytes, **kwargs)
+
+    async def submit(self, pdf_bytes: bytes, priority: int = 0, as_list: bool = False):
+        """
+        Queue a PDF to be parsed and wait for the parsed dictionary.
+        Raise ``asyncio.QueueFull`` if the queue is full.
+        """
+        key = (hashlib.sha256(pdf_bytes).hexdigest(), as_list)
+        future = self.in_flight.get(key)
+        if future is None:
+            future = asyncio.get_running_loop().create_future()
+            self.queue.put_nowait((priority, next(self.counter), key, pdf_bytes))
+            self.in_flight[key] = future
+        # shield so that a disconnected client does not cancel other waiters
+        self.n_waiting += 1
+        try:
+            return await asyncio.shield(future)
+        except asyncio.CancelledError:
+            if future.cancelled():
+                # the request is still alive but the service is stopping
+                raise RuntimeError("Service is stopping")
+            raise
+        finally:
+            self.n_waiting -= 1
+
+    async def worker(self):
+        """
+        Take PDFs from the queue and parse them one at a time
+        """
+        loop = asyncio.get_running_loop()
+        while True:
+            _, _, key, pdf_bytes = await self.queue.get()
+            future = self.in_flight[key]
+            try:
+                article_dict = await loop.run_in_executor(
+                    None, self.parse_pdf, pdf_bytes, key[1]
+                )
+                future.set_result(article_dict)
+            except asyncio.CancelledError:
+                # the service is stopping, do not leave the waiters hanging
+                future.cancel()
+                raise
+            except Exception as e:
+                future.set_exception(e)
+            finally:
+                # later requests of the same PDF are parsed again
+                del self.in_flight[key]
+                self.queue.task_done()
+
+    async def handle(self, reader, writer):
+        """
+        Handle an HTTP/1.1 request, one request per connection
+        """
+        try:
+            status, body = await self.handle_request(reader)
+        except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ValueError):
+            status, body = 400, {"error": "Malformed request"}
+        content = json.dumps(body).encode("utf-8")
+        header = (
+            "HTTP/1.1 %d %s\r\n"
+            "Content-Type: application/json\r\n"
+            "Content-Length: %d\r\n"
+            "Connection: close\r\n\r\n" % (status, HTTP_STATUS[status], len(content))
+        )
+        try:
+            writer.write(header.encode("latin-1") + content)
+            await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def handle_request(self, reader):
+        """
+        Read an HTTP request and return status code and dictionary of the response
+        """
+        request_line = await reader.readuntil(b"\r\n")
+        method, target, _ = request_line.decode("latin-1").split(" ", 2)
+        headers = {}
+        while True:
+            line = await reader.readuntil(b"\r\n")
+            if line == b"\r\n":
+                break
+            name, value = line.decode("latin-1").split(":", 1)
+            headers[name.strip().lower()] = value.strip()
+
+        url = urlparse(target)
+        query = parse_qs(url.query)
+        if url.path == "/status":
+            if method != "GET":
+                return 405, {"error": "Use GET for /status"}
+            return 200, self.status()
+        if url.path != "/parse":
+            return 404, {"error": "Unknown path %s" % url.path}
+        if method != "POST":
+            return 405, {"error": "Use POST for /parse"}
+
+        content_length = int(headers.get("content-length", 0))
+        if content_length == 0:
+            return 400, {"error": "Request body must be the PDF bytes"}
+        if content_length > MAX_PDF_SIZE:
+            return 413, {"error": "PDF is larger than %d bytes" % MAX_PDF_SIZE}
+        pdf_bytes = await reader.readexactly(content_length)
+        priority = int(query.get("priority", ["0"])[0])
+        as_list = query.get("as_list", ["false"])[0].lower() in ("1", "true")
+
+        try:
+            article_dict = await self.submit(pdf_bytes, priority=priority, as_list=as_list)
+        except asyncio.QueueFull:
+            return 503, {"error": "Queue is full, try again later"}
+        except Exception as e:
+            return 502, {"error": "Cannot parse PDF: %s" % e}
+        if article_dict is None:
+            return 502, {"error": "GROBID did not return a parsed article"}
+        return 200, article_dict
+
+    async def start(self, host: str = "127.0.0.1", port: int = 8080):
+        """
+        Start the workers and the HTTP server
+        """
+        self.queue = asyncio.PriorityQueue(maxsize=self.max_queue)
+        self.workers = [
+            asyncio.create_task(self.worker()) for _ in range(self.n_workers)
+        ]
+        self.server = await asyncio.start_server(self.handle, host, port)
+        return self.server
+
+    async def stop(self):
+        """
+        Stop the HTTP server and the workers
+        """
+        if self.server is not None:
+            self.server.close()
+        # cancelled workers remove their PDF from ``in_flight``, so collect
+        # the futures first to cancel every waiting request
+        futures = list(self.in_flight.values())
+        for worker in self.workers:
+            worker.cancel()
+        await asyncio.gather(*self.workers, return_exceptions=True)
+        self.workers = []
+        for future in futures:
+            future.cancel()
+        self.in_flight = {}
+        # open connections are answered once their futures are cancelled
+        if self.server is not None:
+            await self.server.wait_closed()
+
+    async def serve(self, host: str = "127.0.0.1", port: int = 8080):
+        """
+        Start the service and serve until cancelled
+        """
+        server = await self.start(host=host, port=port)
+        try:
+            await server.serve_forever()
+        finally:
+            await self.stop()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve scipdf parser over HTTP")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--grobid_url", default=GROBID_URL)
+    parser.add_argument("--n_workers", type=int, default=4)
+    parser.add_argument("--max_queue", type=int, default=100)
+    args = parser.parse_args()
+    service = ParseService(
+        grobid_url=args.grobid_url,
+        n_workers=args.n_workers,
+        max_queue=args.max_queue,
+    )
+    asyncio.run(service.serve(host=args.host, port=args.port))
@@ -0,0 +1,203 @@
+import re
+import os
+import os.path as op
+from functools import partial
+from concurrent.futures import ProcessPoolExecutor
+import fitz
+
+
+# default rules to route a PDF to GROBID, skip list or OCR queue
+TRIAGE_RULES = {
+    "min_pages": 1,  # skip PDFs with fewer pages
+    "max_pages": 100,  # skip PDFs with more pages e.g. books, theses
+    "min_text_coverage": 0.5,  # send to OCR if fewer pages have text layer
+    "require_paper": False,  # skip PDFs that do not look like a paper
+}
+MIN_CHARS_PER_PAGE = 100  # page with fewer characters has no text layer
+N_SAMPLE_PAGES = 10  # maximum number of pages to check for text layer
+N_SIGNAL_PAGES = 2  # number of first and last pages to look for paper signals
+
+PAPER_SIGNALS = {
+    "has_abstract": re.compile(r"\babstract\b", re.IGNORECASE),
+    "has_introduction": re.compile(r"\bintroduction\b", re.IGNORECASE),
+    "has_references": re.compile(
+        r"\b(references|bibliography|literature cited)\b", re.IGNORECASE
+    ),
+    "has_doi": re.compile(r"\b(doi|arxiv)\b\s*:?\s*\S+", re.IGNORECASE),
+}
+
+
+def triage_pdf(pdf_path):
+    """
+    Quickly inspect a PDF using PyMuPDF without parsing it with GROBID
+
+    Parameters
+    ==========
+    pdf_path: str or bytes, path to PDF file or bytes string of PDF
+
+    Output
+    ======
+    report: dict, dictionary of PDF properties in the following format
+        {
+            'pdf_path': ..., path to PDF or None if bytes are given
+            'is_valid': ..., False if the file is missing, corrupted or not a PDF
+            'is_encrypted': ..., True if the PDF is encrypted, e.g. with an owner password only
+            'needs_password': ..., True if the PDF needs a password to be read
+            'n_pages': ...,
+            'n_text_pages': ..., number of sampled pages with text layer
+            'text_coverage': ..., fraction of sampled pages with text layer
+            'has_abstract': ..., 'has_introduction': ..., 'has_references': ..., 'has_doi': ...,
+            'looks_like_paper': ..., True if at least 2 of the signals above are found
+            'error': ..., error message if the PDF cannot be opened
+        }
+    """
+    report = {
+        "pdf_path": pdf_path if isinstance(pdf_path, str) else None,
+        "is_valid": False,
+        "is_encrypted": False,
+        "needs_password": False,
+        "n_pages": 0,
+        "n_text_pages": 0,
+        "text_coverage": 0.0,
+        "looks_like_paper": False,
+        "error": "",
+    }
+    for signal in PAPER_SIGNALS.keys():
+        report[signal] = False
+
+    try:
+        if isinstance(pdf_path, bytes):
+            doc = fitz.open(stream=pdf_path, filetype="pdf")
+        elif isinstance(pdf_path, str) and op.isfile(pdf_path):
+            doc = fitz.open(pdf_path, filetype="pdf")
+        else:
+            report["error"] = "File not found"
+            return report
+    except Exception as e:
+        report["error"] = str(e)
+        return report
+
+    with doc:
+        # PDFs encrypted with an owner password only are opened without password
+        # and are only reported as encrypted in their metadata
+        report["is_encrypted"] = bool(
+            doc.is_encrypted or (doc.metadata or {}).get("encryption")
+        )
+        if doc.needs_pass:
+            report["needs_password"] = True
+            report["error"] = "Password protected"
+            return report
+        n_pages = doc.page_count
+        report["n_pages"] = n_pages
+        report["is_valid"] = doc.is_pdf and n_pages > 0
+        if not report["is_valid"]:
+            return report
+
+        # sample pages evenly across the document for the text layer
+        n_sample = min(n_pages, N_SAMPLE_PAGES)
+        sample_pages = sorted(set([i * n_pages // n_sample for i in range(n_sample)]))
+        signal_pages = set(range(min(N_SIGNAL_PAGES, n_pages)))
+        signal_pages |= set(range(max(0, n_pages - N_SIGNAL_PAGES), n_pages))
+
+        # a page has a text layer if it has enough extracted characters, e.g. a
+        # scanned page with a page number or a watermark does not. Pages without
+        # any font cannot have text, so text extraction is skipped for them
+        n_text_pages = 0
+        signal_text = []
+        try:
+            for i in sorted(set(sample_pages) | signal_pages):
+                if len(doc.get_page_fonts(i)) > 0:
+                    text = doc.load_page(i).get_text("text")
+                else:
+                    text = ""
+                if i in sample_pages and len(text.strip()) >= MIN_CHARS_PER_PAGE:
+                    n_text_pages += 1
+                if i in signal_pages:
+                    signal_text.append(text)
+        except Exception as e:
+            report["is_valid"] = False
+            report["error"] = str(e)
+            return report
+
+    report["n_text_pages"] = n_text_pages
+    report["text_coverage"] = n_text_pages / len(sample_pages)
+    signal_text = "\n".join(signal_text)
+    for signal, regex in PAPER_SIGNALS.items():
+        report[signal] = regex.search(signal_text) is not None
+    report["looks_like_paper"] = sum([report[s] for s in PAPER_SIGNALS.keys()]) >= 2
+    return report
+
+
+def route_pdf(report, rules: dict = TRIAGE_RULES):
+    """
+    Decide where a PDF should go from its triage report, see ``triage_pdf``
+
+    Parameters
+    ==========
+    report: dict, triage report from ``triage_pdf``
+    rules: dict, routing rules, missing keys fall back to ``TRIAGE_RULES``
+
+    Output
+    ======
+    route: str, ``grobid`` to parse the PDF with GROBID, ``ocr`` for PDFs
+        without enough text layer and ``skip`` for invalid, password protected
+        or out of scope PDFs
+    """
+    rules = {**TRIAGE_RULES, **rules}
+    if not report["is_valid"] or report["needs_password"]:
+        return "skip"
+    if not rules["min_pages"] <= report["n_pages"] <= rules["max_pages"]:
+        return "skip"
+    if report["text_coverage"] < rules["min_text_coverage"]:
+        return "ocr"
+    if rules["require_paper"] and not report["looks_like_paper"]:
+        return "skip"
+    return "grobid"
+
+
+def triage_and_route_pdf(pdf_path, rules: dict = TRIAGE_RULES):
+    """
+    Triage a given PDF and add its ``route`` to the triage report
+    """
+    report = triage_pdf(pdf_path)
+    report["route"] = route_pdf(report, rules=rules)
+    return report
+
+
+def triage_pdfs(
+    pdf_paths: list,
+    rules: dict = TRIAGE_RULES,
+    n_jobs: int = None,
+    chunksize: int = 16,
+):
+    """
+    Triage a list of PDFs in parallel using a process pool
+
+    Parameters
+    ==========
+    pdf_paths: list, list of paths to PDF files
+    rules: dict, routing rules, see ``TRIAGE_RULES``
+    n_jobs: int, number of processes, default is the number of CPUs
+    chunksize: int, number of PDFs sent to a process at a time
+
+    Output
+    ======
+    reports: list, list of triage reports with ``route`` in the same order as ``pdf_paths``
+
+    Example
+    =======
+    >> reports = triage_pdfs(list_pdf_paths(pdf_folder))
+    >> grobid_paths = [r['pdf_path'] for r in reports if r['route'] == 'grobid']
+    """
+    n_jobs = n_jobs or os.cpu_count() or 1
+    if n_jobs == 1:
+        return [triage_and_route_pdf(p, rules=rules) for p in pdf_paths]
+    with ProcessPoolExecutor(max_workers=n_jobs) as executor:
+        reports = list(
+            executor.map(
+                partial(triage_and_route_pdf, rules=rules),
+                pdf_paths,
+                chunksize=chunksize,
+            )
+        )
+    return reports
@@ -0,0 +1,193 @@
+import random
+import importlib
+import statistics
+import threading
+import time
+import fitz
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import pytest
+from scipdf.pdf.limiter import AdaptiveLimiter
+
+# ``scipdf.pdf.parse_pdf`` is shadowed by the ``parse_pdf`` function
+parse_pdf_module = importlib.import_module("scipdf.pdf.parse_pdf")
+
+
+def run_requests(limiter, n_requests, latency_fn):
+    n_decrease = 0
+    for i in range(n_requests):
+        ticket = limiter.acquire()
+        limit = limiter.limit
+        latency, size = latency_fn(i)
+        limiter.release(latency, ok=True, size=size, ticket=ticket)
+        n_decrease += limiter.limit < limit
+    return n_decrease
+
+
+def test_long_pdfs_do_not_decrease_limit():
+    random.seed(0)
+    limiter = AdaptiveLimiter(max_limit=16, initial_limit=16)
+
+    def latency_fn(i):
+        n_pages = 60 if random.random() < 1 / 21 else 8
+        return 0.25 * n_pages * random.uniform(0.7, 1.4), n_pages
+
+    assert run_requests(limiter, 2000, latency_fn) == 0
+    assert limiter.limit == 16
+
+
+def test_single_slow_request_does_not_decrease_limit():
+    limiter = AdaptiveLimiter(max_limit=16, initial_limit=16)
+    assert run_requests(limiter, 100, lambda i: (10.0 if i == 50 else 1.0, 1.0)) == 0
+
+
+def test_queueing_decreases_limit():
+    random.seed(0)
+    limiter = AdaptiveLimiter(max_limit=16)
+    limits = []
+
+    def latency_fn(i):
+        # latency grows once requests queue above a capacity of 4
+        limits.append(limiter.limit)
+        return random.uniform(0.7, 1.4) * max(1, limiter.limit / 4), 1.0
+
+    assert run_requests(limiter, 2000, latency_fn) > 0
+    assert statistics.median(limits[500:]) <= 6
+
+
+def test_busy_responses_decrease_limit():
+    limiter = AdaptiveLimiter(max_limit=16, initial_limit=16)
+    limiter.acquire()
+    limiter.release(1.0, ok=False)
+    assert limiter.limit == 8
+    assert limiter.status() == {
+        "limit": 8,
+        "max_limit": 16,
+        "in_flight": 0,
+        "queue_depth": 0,
+    }
+
+
+def test_concurrent_busy_responses_decrease_limit_once():
+    limiter = AdaptiveLimiter(max_limit=16, initial_limit=16)
+    tickets = [limiter.acquire() for _ in range(16)]
+    for ticket in tickets:
+        limiter.release(1.0, ok=False, ticket=ticket)
+    assert limiter.limit == 8
+    # requests sent after the decrease count again
+    limiter.release(1.0, ok=False, ticket=limiter.acquire())
+    assert limiter.limit == 4
+
+
+def test_queue_depth_counts_pending_documents():
+    limiter = AdaptiveLimiter(max_limit=4, initial_limit=2)
+    limiter.add_pending(10)
+    limiter.acquire()
+    limiter.acquire()
+    assert limiter.status()["in_flight"] == 2
+    assert limiter.status()["queue_depth"] == 8
+    limiter.release(1.0)
+    limiter.remove_pending()
+    assert limiter.queue_depth == 8
+
+
+@pytest.fixture
+def grobid():
+    """
+    Stub GROBID server that answers with ``server.status`` after ``server.delay`` seconds
+    """
+
+    class StubGrobid(BaseHTTPRequestHandler):
+        def do_POST(self):
+            self.rfile.read(int(self.headers["Content-Length"]))
+            server.n_calls += 1
+            if server.delay > 0:
+                time.sleep(server.delay)
+            self.send_response(server.status)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubGrobid)
+    server.n_calls = 0
+    server.status = 503
+    server.delay = 0
+    server.url = "http://127.0.0.1:%d/api/processFulltextDocument" % server.server_port
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def test_post_to_grobid_returns_none_when_busy(grobid, monkeypatch):
+    sleeps = []
+    monkeypatch.setattr(parse_pdf_module.time, "sleep", sleeps.append)
+    limiter = AdaptiveLimiter(max_limit=4, initial_limit=4)
+    text = parse_pdf_module.post_to_grobid(
+        grobid.url, [("input", b"%PDF")], limiter=limiter
+    )
+    assert text is None
+    assert grobid.n_calls == parse_pdf_module.N_RETRIES + 1
+    assert len(sleeps) == parse_pdf_module.N_RETRIES  # no sleep after the last try
+    assert limiter.in_flight == 0
+
+
+def test_post_to_grobid_reports_timeout(grobid, monkeypatch):
+    monkeypatch.setattr(parse_pdf_module, "N_RETRIES", 0)
+    grobid.status = 200
+    grobid.delay = 1
+    limiter = AdaptiveLimiter(max_limit=4, initial_limit=4)
+    text = parse_pdf_module.post_to_grobid(
+        grobid.url, [("input", b"%PDF")], limiter=limiter, timeout=0.1
+    )
+    assert text is None
+    assert limiter.limit == 2
+    assert limiter.in_flight == 0
+
+
+def test_post_to_grobid_normalizes_latency_by_pages(grobid):
+    grobid.status = 200
+    # one page with a large image and many pages of small text
+    image_doc = fitz.open()
+    noise = random.Random(0).randbytes(3 * 1000 * 1000)
+    pixmap = fitz.Pixmap(fitz.csRGB, 1000, 1000, noise, False)
+    image_doc.new_page().insert_image(fitz.Rect(0, 0, 500, 500), pixmap=pixmap)
+    text_doc = fitz.open()
+    for _ in range(20):
+        text_doc.new_page().insert_text((50, 50), "Some text")
+    image_pdf, text_pdf = image_doc.tobytes(), text_doc.tobytes()
+    assert len(image_pdf) > 100 * len(text_pdf)
+
+    sizes = []
+
+    class RecordingLimiter(AdaptiveLimiter):
+        def release(self, latency, ok=True, size=1.0, ticket=None):
+            sizes.append(size)
+            super().release(latency, ok=ok, size=size, ticket=ticket)
+
+    limiter = RecordingLimiter(max_limit=4, initial_limit=4)
+    for pdf_bytes in [image_pdf, text_pdf, b"not a pdf"]:
+        parse_pdf_module.post_to_grobid(
+            grobid.url, [("input", pdf_bytes)], limiter=limiter
+        )
+    assert sizes == [1, 20, 1]
+
+
+def test_parse_pdfs_to_dict_reports_waiting_pdfs(grobid):
+    grobid.status = 200
+    grobid.delay = 0.2
+    limiter = AdaptiveLimiter(max_limit=2, initial_limit=2)
+    thread = threading.Thread(
+        target=parse_pdf_module.parse_pdfs_to_dict,
+        args=([b"%%PDF %d" % i for i in range(10)],),
+        kwargs={"limiter": limiter, "grobid_url": grobid.url.rsplit("/api", 1)[0]},
+    )
+    thread.start()
+    for _ in range(100):
+        if limiter.in_flight == 2:
+            break
+        time.sleep(0.01)
+    assert limiter.status()["queue_depth"] == 8
+    thread.join()
+    assert limiter.status()["queue_depth"] == 0
@@ -0,0 +1,154 @@
+import json
+import asyncio
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import pytest
+from scipdf.pdf.service import ParseService
+
+
+TEI_XML = b"""<TEI xmlns="http://www.tei-c.org/ns/1.0"><teiHeader><fileDesc>
+<titleStmt><title level="a" type="main">Stub Paper</title></titleStmt>
+<publicationStmt><date type="published" when="2020"/></publicationStmt>
+<sourceDesc><biblStruct><analytic><author><persName><forename type="first">A</forename>
+<surname>B</surname></persName></author></analytic></biblStruct></sourceDesc>
+</fileDesc><profileDesc><abstract><div><p>Abstract text.</p></div></abstract></profileDesc>
+</teiHeader><text><body><div xmlns="http://www.tei-c.org/ns/1.0"><head>Introduction</head>
+<p>Hello.</p></div></body><back><div type="references"><listBibl></listBibl></div></back>
+</text></TEI>"""
+
+
+@pytest.fixture
+def grobid():
+    """
+    Stub GROBID server that records request bodies and answers once ``release`` is set
+    """
+
+    class StubGrobid(BaseHTTPRequestHandler):
+        def do_POST(self):
+            server.calls.append(self.rfile.read(int(self.headers["Content-Length"])))
+            server.release.wait(timeout=10)
+            self.send_response(200)
+            self.send_header("Content-Length", str(len(TEI_XML)))
+            self.end_headers()
+            self.wfile.write(TEI_XML)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubGrobid)
+    server.calls = []
+    server.release = threading.Event()
+    server.url = "http://127.0.0.1:%d" % server.server_port
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield server
+    server.release.set()
+    server.shutdown()
+    server.server_close()
+
+
+async def request(port, data):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    writer.write(data)
+    await writer.drain()
+    response = await reader.read()
+    writer.close()
+    head, _, content = response.partition(b"\r\n\r\n")
+    return int(head.split()[1]), json.loads(content)
+
+
+async def post(port, pdf_bytes, target=b"/parse"):
+    return await request(
+        port,
+        b"POST %s HTTP/1.1\r\nContent-Length: %d\r\n\r\n" % (target, len(pdf_bytes))
+        + pdf_bytes,
+    )
+
+
+async def wait_for(condition):
+    for _ in range(500):
+        if condition():
+            return
+        await asyncio.sleep(0.01)
+    raise TimeoutError("Condition was not met")
+
+
+def run_service(grobid, test, **kwargs):
+    async def main():
+        service = ParseService(grobid_url=grobid.url, **kwargs)
+        server = await service.start(port=0)
+        try:
+            await test(service, server.sockets[0].getsockname()[1])
+        finally:
+            await service.stop()
+
+    asyncio.run(main())
+
+
+def test_identical_requests_share_one_grobid_call(grobid):
+    async def test(service, port):
+        tasks = [asyncio.create_task(post(port, b"%PDF same")) for _ in range(10)]
+        await wait_for(lambda: service.n_waiting == 10)
+        grobid.release.set()
+        responses = await asyncio.gather(*tasks)
+        assert [status for status, _ in responses] == [200] * 10
+        assert all(body["title"] == "Stub Paper" for _, body in responses)
+        assert len(grobid.calls) == 1
+
+    run_service(grobid, test, n_workers=2)
+
+
+def test_full_queue_returns_503(grobid):
+    async def test(service, port):
+        first = asyncio.create_task(post(port, b"%PDF 1"))
+        await wait_for(lambda: len(grobid.calls) == 1)  # taken by the only worker
+        second = asyncio.create_task(post(port, b"%PDF 2"))
+        await wait_for(lambda: service.queue.qsize() == 1)
+        status, body = await post(port, b"%PDF 3")
+        assert status == 503
+        grobid.release.set()
+        assert (await first)[0] == 200
+        assert (await second)[0] == 200
+
+    run_service(grobid, test, n_workers=1, max_queue=1)
+
+
+def test_malformed_requests_return_400(grobid):
+    async def test(service, port):
+        long_header = b"GET /status HTTP/1.1\r\nX-Long: " + b"a" * 70000 + b"\r\n\r\n"
+        assert (await request(port, long_header))[0] == 400
+        assert (await post(port, b""))[0] == 400
+        assert (await request(port, b"GET /unknown HTTP/1.1\r\n\r\n"))[0] == 404
+
+    run_service(grobid, test)
+
+
+def test_lower_priority_value_is_parsed_first(grobid):
+    async def test(service, port):
+        first = asyncio.create_task(post(port, b"%PDF blocking"))
+        await wait_for(lambda: len(grobid.calls) == 1)  # taken by the only worker
+        low = asyncio.create_task(post(port, b"%PDF low", b"/parse?priority=5"))
+        await wait_for(lambda: service.queue.qsize() == 1)
+        high = asyncio.create_task(post(port, b"%PDF high", b"/parse?priority=0"))
+        await wait_for(lambda: service.queue.qsize() == 2)
+        grobid.release.set()
+        responses = await asyncio.gather(first, low, high)
+        assert [status for status, _ in responses] == [200] * 3
+        assert b"%PDF high" in grobid.calls[1]
+        assert b"%PDF low" in grobid.calls[2]
+
+    run_service(grobid, test, n_workers=1)
+
+
+def test_stop_answers_waiting_requests(grobid):
+    async def test(service, port):
+        parsing = asyncio.create_task(post(port, b"%PDF parsing"))
+        await wait_for(lambda: len(grobid.calls) == 1)  # taken by the only worker
+        queued = asyncio.create_task(post(port, b"%PDF queued"))
+        await wait_for(lambda: service.queue.qsize() == 1)
+        await asyncio.wait_for(service.stop(), timeout=5)
+        responses = await asyncio.wait_for(asyncio.gather(parsing, queued), timeout=5)
+        assert [status for status, _ in responses] == [502] * 2
+        assert service.status()["in_flight"] == 0
+        grobid.release.set()  # let the parsing thread finish
+
+    run_service(grobid, test, n_workers=1)
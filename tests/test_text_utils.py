@@ -0,0 +1,79 @@
+import warnings
+import pytest
+import textstat
+from scipdf.features.text_utils import (
+    compute_readability_stats,
+    compute_readability_stats_batch,
+)
+
+
+ABSTRACT = (
+    "Sepsis is a poorly understood and potentially life-threatening complication "
+    "that can occur as a result of infection. Early detection and treatment improve "
+    "patient outcomes, and as such it poses an important challenge in medicine. In "
+    "this work, we develop a flexible classifier that leverages streaming lab results, "
+    "vitals, and medications to predict sepsis before it occurs. We model patient "
+    "clinical time series with multi-output Gaussian processes, maintaining uncertainty "
+    "about the physiological state of a patient while also imputing missing values. "
+    "The mean function takes into account the effects of medications administered on "
+    "the trajectories of the physiological variables. Latent function values from the "
+    "Gaussian process are then fed into a deep recurrent neural network to classify "
+    "patient encounters as septic or not, and the overall model is trained end-to-end "
+    "using back-propagation. We train and validate our model on a large dataset of "
+    "18 months of heterogeneous inpatient stays from the Duke University Health System, "
+    "and develop a new procedure to identify the onset time of sepsis. Our method "
+    "substantially outperforms clinical baselines (e.g. NEWS, qSOFA) by 3.5%."
+)
+
+TEXTS = [
+    "",
+    "   ",
+    "...",
+    "a",
+    "Hello.",
+    "The cat sat on the mat. It was happy? Yes! It's the patients' cat, isn't it?",
+    "U.S. hospitals don't report 1,024 cases; (n=3) were 'excluded' - see Fig. 2.",
+    "Résumé naïve café. Über-complicated multi-dimensional characterization!",
+    ABSTRACT,
+    ABSTRACT + "\n\n" + ABSTRACT.upper(),
+]
+
+
+def textstat_readability_stats(text):
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", DeprecationWarning)
+        return {
+            "flesch_reading_ease": textstat.flesch_reading_ease(text),
+            "smog": textstat.smog_index(text),
+            "flesch_kincaid_grade": textstat.flesch_kincaid_grade(text),
+            "coleman_liau_index": textstat.coleman_liau_index(text),
+            "automated_readability_index": textstat.automated_readability_index(text),
+            "dale_chall": textstat.dale_chall_readability_score(text),
+            "difficult_words": textstat.difficult_words(text),
+            "linsear_write": textstat.linsear_write_formula(text),
+            "gunning_fog": textstat.gunning_fog(text),
+            "text_standard": textstat.text_standard(text),
+            "n_syllable": textstat.syllable_count(text),
+            "avg_letter_per_word": textstat.avg_letter_per_word(text),
+            "avg_sentence_length": textstat.avg_sentence_length(text),
+        }
+
+
+@pytest.mark.parametrize("text", TEXTS)
+def test_compute_readability_stats_matches_textstat(text):
+    readability_dict = compute_readability_stats(text)
+    expected_dict = textstat_readability_stats(text)
+    assert readability_dict.keys() == expected_dict.keys()
+    for key, expected in expected_dict.items():
+        assert readability_dict[key] == pytest.approx(expected, abs=1e-9), key
+
+
+def test_compute_readability_stats_batch():
+    texts = TEXTS + TEXTS[::-1]
+    readability_list = compute_readability_stats_batch(texts)
+    assert len(readability_list) == len(texts)
+    for text, readability_dict in zip(texts, readability_list):
+        assert readability_dict == compute_readability_stats(text)
+    # identical texts do not share the same dictionary
+    readability_list[0]["smog"] = None
+    assert readability_list[-1]["smog"] is not None
@@ -0,0 +1,96 @@
+import os.path as op
+import fitz
+from scipdf.pdf.triage import route_pdf, triage_pdf, triage_and_route_pdf
+
+EXAMPLE_PDF = op.join(
+    op.dirname(op.dirname(op.abspath(__file__))),
+    "example_data",
+    "futoma2017improved.pdf",
+)
+
+
+def make_pdf(n_pages=3, text=None, image=False, **save_kwargs):
+    """
+    Build a small PDF in memory, with ``text`` or an image on every page
+    """
+    doc = fitz.open()
+    for _ in range(n_pages):
+        page = doc.new_page()
+        if text is not None:
+            page.insert_textbox(fitz.Rect(50, 50, 550, 800), text)
+        if image:
+            pixmap = fitz.Pixmap(fitz.csRGB, fitz.IRect(0, 0, 200, 200), False)
+            pixmap.set_rect(pixmap.irect, (120, 120, 120))
+            page.insert_image(fitz.Rect(50, 50, 550, 550), pixmap=pixmap)
+    pdf_bytes = doc.tobytes(**save_kwargs)
+    doc.close()
+    return pdf_bytes
+
+
+PAPER_TEXT = (
+    "Abstract\nWe study a problem.\n1 Introduction\n"
+    + "Some sentence about the method and the results. " * 10
+    + "\nReferences\n"
+)
+
+
+def test_example_paper_is_routed_to_grobid():
+    report = triage_and_route_pdf(EXAMPLE_PDF)
+    assert report["is_valid"]
+    assert not report["is_encrypted"]
+    assert report["n_pages"] > 1
+    assert report["text_coverage"] == 1.0
+    assert report["looks_like_paper"]
+    assert report["route"] == "grobid"
+
+
+def test_image_only_pdf_is_routed_to_ocr():
+    report = triage_and_route_pdf(make_pdf(image=True))
+    assert report["is_valid"]
+    assert report["n_text_pages"] == 0
+    assert report["route"] == "ocr"
+
+
+def test_password_protected_pdf_is_skipped():
+    pdf_bytes = make_pdf(
+        text=PAPER_TEXT,
+        encryption=fitz.PDF_ENCRYPT_AES_256,
+        owner_pw="owner",
+        user_pw="user",
+    )
+    report = triage_and_route_pdf(pdf_bytes)
+    assert report["is_encrypted"]
+    assert report["needs_password"]
+    assert report["route"] == "skip"
+
+
+def test_owner_password_only_pdf_is_parsed():
+    pdf_bytes = make_pdf(
+        text=PAPER_TEXT, encryption=fitz.PDF_ENCRYPT_AES_256, owner_pw="owner"
+    )
+    report = triage_and_route_pdf(pdf_bytes)
+    assert report["is_encrypted"]
+    assert not report["needs_password"]
+    assert report["route"] == "grobid"
+
+
+def test_invalid_pdfs_are_skipped():
+    for pdf_path in [b"not a pdf at all", "missing.pdf"]:
+        report = triage_and_route_pdf(pdf_path)
+        assert not report["is_valid"]
+        assert report["error"]
+        assert report["route"] == "skip"
+
+
+def test_route_pdf_rules():
+    report = triage_pdf(make_pdf(n_pages=5, text="Some text without signals. " * 20))
+    assert not report["looks_like_paper"]
+    assert route_pdf(report) == "grobid"
+    assert route_pdf(report, rules={"require_paper": True}) == "skip"
+    assert route_pdf(report, rules={"max_pages": 4}) == "skip"
+    assert route_pdf(report, rules={"min_pages": 6}) == "skip"
+    assert route_pdf(report, rules={"min_text_coverage": 1.1}) == "ocr"
+
+    paper_report = triage_pdf(make_pdf(text=PAPER_TEXT))
+    assert paper_report["looks_like_paper"]
+    assert route_pdf(paper_report, rules={"require_paper": True}) == "grobid"